@@ -0,0 +1,332 @@
+"""Runs the benchmark suite of the package hot paths and writes the
+results to a JSON file, optionally comparing them against a baseline
+results file, e.g. from the project root directory
+
+    python benchmarks/suite.py --output bench.json
+    python benchmarks/suite.py --baseline bench.json
+
+The suite can also be run within Blender, where the benchmarks
+requiring `bpy` are included too, with any options given after `--`
+
+    blender --background --factory-startup --python benchmarks/suite.py -- --output bench.json
+
+All results are times, so lower is better. When comparing, a result
+that is slower than its baseline by more than the `--tolerance`
+fraction is reported as a regression, and the script exits with an
+error.
+
+"""
+
+import argparse
+import json
+import os
+import platform
+import select
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+from basilisp.lang import keyword as kw
+
+from basilisp_blender import eval as evl
+from basilisp_blender import nrepl
+from basilisp_blender.batch import _bdecode, _bencode, _Incomplete
+
+
+def _best(f, number, repeat):
+    "Return the best time in microseconds of a call to `f`."
+    return min(timeit.repeat(f, number=number, repeat=repeat)) / number * 1e6
+
+
+def _subprocess_ms(code, repeat):
+    """Return the best time in milliseconds of running the Python `code`
+    in a new process, less the time of running an empty one.
+
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+        return time.perf_counter() - start
+
+    empty = min(run("pass") for _ in range(repeat))
+    return (min(run(code) for _ in range(repeat)) - empty) * 1000
+
+
+def bench_import(repeat):
+    "The time to import `basilisp_blender`."
+    return _subprocess_ms("import basilisp_blender", repeat)
+
+
+def bench_first_eval(repeat):
+    """The time to import `basilisp_blender` and evaluate a first form,
+    including the Basilisp runtime initialization.
+
+    """
+    return _subprocess_ms(
+        "from basilisp_blender.eval import eval_str; eval_str('(+ 1 2)')", repeat
+    )
+
+
+def bench_eval_str_cached(repeat):
+    "The time of an `eval_str` call served from its cache."
+    evl.eval_str("(+ 1 2)")
+    return _best(lambda: evl.eval_str("(+ 1 2)"), 2000, repeat)
+
+
+def bench_eval_str_uncached(repeat):
+    "The time of an `eval_str` call reading and compiling its code."
+    return _best(lambda: evl.eval_str("(+ 1 2)", cache=False), 200, repeat)
+
+
+def _bench_file(forms):
+    "Write the `forms` to a new temporary Basilisp file and return its path."
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".lpy", prefix="basilispblenderbench", delete=False
+    ) as f:
+        f.write("\n".join(forms))
+    return f.name
+
+
+def _eval_file_forms():
+    return [
+        f"(defn bench-f{i} [x] (let [y (* x {i})] (if (pos? y) (inc y) (dec y))))"
+        for i in range(20)
+    ] + ["(bench-f19 3)"]
+
+
+def bench_eval_file(repeat):
+    "The time of an `eval_file` call of a 21 forms file."
+    path = _bench_file(_eval_file_forms())
+    try:
+        return _best(lambda: evl.eval_file(path), 10, repeat)
+    finally:
+        os.remove(path)
+
+
+def bench_eval_file_cached(repeat):
+    "The time of an `eval_file` call of a 21 forms file from its bytecode cache."
+    path = _bench_file(_eval_file_forms())
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            evl.eval_file(path, cache=True, cache_dir=cache_dir)
+            return _best(
+                lambda: evl.eval_file(path, cache=True, cache_dir=cache_dir), 10, repeat
+            )
+    finally:
+        os.remove(path)
+
+
+def _nrepl_eval(sock, work_fn, buffer, code, id):
+    """Send an eval request of `code` over `sock` and run `work_fn` until
+    its done response is received, and return the bytes left over in
+    `buffer`.
+
+    """
+    sock.sendall(_bencode({"op": "eval", "code": code, "ns": "user", "id": id}))
+    while True:
+        work_fn()
+        while select.select([sock], [], [], 0.0005)[0]:
+            data = sock.recv(65536)
+            if not data:
+                raise ConnectionError("nREPL server connection closed")
+            buffer += data
+            while True:
+                try:
+                    message, index = _bdecode(buffer)
+                except _Incomplete:
+                    break
+                buffer = buffer[index:]
+                if message.get("id") == id and "done" in message.get("status", []):
+                    return buffer
+
+
+def bench_nrepl_eval(repeat):
+    """The round-trip time of an nREPL eval request through a server
+    started as with `server_thread_async_start`, with the queued
+    request executed as soon as it arrives.
+
+    """
+    server = nrepl._server_start("127.0.0.1", 0, None)
+    work_fn = server.get(kw.keyword("work-fn"))
+    port = server.get(kw.keyword("port"))
+    try:
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            ids = iter(range(1, 1_000_000))
+            buffer = b""
+            for _ in range(20):
+                buffer = _nrepl_eval(sock, work_fn, buffer, "(+ 1 2)", next(ids))
+
+            def round_trip():
+                nonlocal buffer
+                buffer = _nrepl_eval(sock, work_fn, buffer, "(+ 1 2)", next(ids))
+
+            return _best(round_trip, 200, repeat)
+    finally:
+        server.get(kw.keyword("shutdown-fn"))()
+
+
+def bench_class_make_call(repeat):
+    """The time of a call to a `class-make*` method accessing three
+    fields.
+
+    """
+    inst = evl.eval_str(
+        """
+        (require 'basilisp-blender.utils)
+        ((basilisp-blender.utils/class-make* BenchGenerated []
+                        [^{:default 1} a
+                         ^{:default 2} b
+                         ^{:default 3} c]
+                        (total [] (python/sum #py [(-a) (-b) (-c)]))))
+        """
+    )
+    return _best(inst.total, 20000, repeat)
+
+
+def _ctrl_make():
+    "Return a new nREPL control panel `ctrl` instance."
+    return evl.eval_str(
+        """
+        (require 'basilisp-blender.control-panel)
+        (#'basilisp-blender.control-panel/ctrl-make)
+        """
+    )
+
+
+def bench_ctrl_info_get(repeat):
+    "The time of a `ctrl-do! :info-get` call of the nREPL control panel."
+    ctrl = _ctrl_make()
+    ctrl_do = evl.eval_str("basilisp-blender.control-panel/ctrl-do!")
+    info_get = kw.keyword("info-get")
+    return _best(lambda: ctrl_do(ctrl, info_get), 20000, repeat)
+
+
+def bench_ctrl_project_dir_set(repeat):
+    """The time of a state changing `ctrl-do! :project-dir-set!` call of
+    the nREPL control panel.
+
+    """
+    ctrl = _ctrl_make()
+    ctrl_do = evl.eval_str("basilisp-blender.control-panel/ctrl-do!")
+    project_dir_set = kw.keyword("project-dir-set!")
+    return _best(lambda: ctrl_do(ctrl, project_dir_set, "/tmp/project"), 20000, repeat)
+
+
+# The benchmarks of the suite, as tuples of their name, the unit of
+# their result, their function, and whether they require `bpy`.
+BENCHMARKS = [
+    ("import_ms", "ms", bench_import, False),
+    ("first_eval_ms", "ms", bench_first_eval, False),
+    ("eval_str_cached_us", "us", bench_eval_str_cached, False),
+    ("eval_str_uncached_us", "us", bench_eval_str_uncached, False),
+    ("eval_file_us", "us", bench_eval_file, False),
+    ("eval_file_cached_us", "us", bench_eval_file_cached, False),
+    ("nrepl_eval_us", "us", bench_nrepl_eval, False),
+    ("class_make_call_us", "us", bench_class_make_call, False),
+    ("ctrl_info_get_us", "us", bench_ctrl_info_get, True),
+    ("ctrl_project_dir_set_us", "us", bench_ctrl_project_dir_set, True),
+]
+
+
+def run(names=None, repeat=5):
+    """Run the `names` benchmarks, or all of them, best of `repeat`, and
+    return their results dict, skipping those requiring `bpy` outside
+    Blender.
+
+    """
+    results = {}
+    for name, unit, f, bpy_required in BENCHMARKS:
+        if names and name not in names:
+            continue
+        if bpy_required and bpy is None:
+            print(f":skipped {name} :requires bpy", file=sys.stderr)
+            continue
+        results[name] = {"value": f(repeat), "unit": unit}
+        print(f":{name} {results[name]['value']:.2f}{unit}", file=sys.stderr)
+    return {
+        "meta": {
+            "basilisp": version("basilisp"),
+            "basilisp-blender": version("basilisp-blender"),
+            "blender": bpy.app.version_string if bpy else None,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of a dict for each of the `results` also found in the
+    `baseline` results, with its "name", "baseline" and "current"
+    values, their "ratio", and whether it is a "regression", i.e. the
+    ratio is higher than 1 + `tolerance`.
+
+    """
+    rows = []
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["value"] / base["value"] if base["value"] else float("inf")
+        rows.append(
+            {
+                "name": name,
+                "baseline": base["value"],
+                "current": result["value"],
+                "ratio": ratio,
+                "regression": ratio > 1 + tolerance,
+            }
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite.")
+    parser.add_argument("--output", help="the JSON file to write the results to")
+    parser.add_argument("--baseline", help="a results JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only", action="append", help="a benchmark to run, can be repeated"
+    )
+    options = parser.parse_args(argv)
+
+    results = run(options.only, options.repeat)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, options.tolerance)
+        for row in rows:
+            print(
+                f":{row['name']} :baseline {row['baseline']:.2f}"
+                f" :current {row['current']:.2f} :ratio {row['ratio']:.2f}"
+                + (" :regression" if row["regression"] else "")
+            )
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    # options are given after `--` when run within Blender
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else sys.argv[1:]
+    sys.exit(main(argv))
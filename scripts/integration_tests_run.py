@@ -0,0 +1,42 @@
+"""Runs the integration tests in parallel, sharded across a number of
+pytest processes, each with its own Blender worker, e.g.
+
+    python scripts/integration_tests_run.py --workers 4 -v
+
+The number of processes defaults to the number of CPUs, and any other
+arguments are passed to pytest. Each shard's output is printed once it
+completes, and the script exits with an error if any shard failed.
+
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+parser = argparse.ArgumentParser(description="Runs the integration tests in parallel.")
+parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+options, pytest_args = parser.parse_known_args()
+
+processes = [
+    subprocess.Popen(
+        [sys.executable, "-m", "pytest", "--integration", f"--shard={i}/{options.workers}"]
+        + pytest_args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    for i in range(options.workers)
+]
+
+failed = []
+for i, process in enumerate(processes):
+    out, _ = process.communicate()
+    print(f"\n:shard {i}/{options.workers} :exit-code {process.returncode}\n")
+    print(out)
+    # 5 is pytest's exit code for when there are no tests in the shard
+    if process.returncode not in (0, 5):
+        failed.append(i)
+
+print(f":shards {options.workers} :failed {failed}")
+sys.exit(1 if failed else 0)
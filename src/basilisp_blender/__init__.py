@@ -1,7 +1,14 @@
-"""Initialize the Basilisp runtime environment."""
+"""Initialize the Basilisp runtime environment.
+
+The runtime is initialized lazily on first use with `init`, so that
+importing this package stays cheap.
+
+"""
 
 import importlib
 import logging
+import threading
+import time
 
 from basilisp import main as basilisp
 from basilisp.lang import compiler
@@ -9,11 +16,15 @@ from basilisp.lang.keyword import Keyword
 from basilisp.lang.util import munge
 
 COMPILER_OPTS = compiler.compiler_opts()
-basilisp.init(COMPILER_OPTS)
 
 LOGGER = logging.getLogger("basilisp-blender")
 LOGGER.addHandler(logging.StreamHandler())
 
+# The time in seconds each startup phase took, see `startup_report`.
+_STARTUP_TIMES = {}
+_INIT_LOCK = threading.RLock()
+
+
 def log_level_set(level, filepath=None):
     """Sets the logger in the `LOGGER` global variable to the
     specified `level`.
@@ -30,14 +41,58 @@ def log_level_set(level, filepath=None):
 
 # log_level_set(logging.DEBUG, "basilisp-blender.log")
 
-def control_panel_create():
+
+def startup_time_record(phase, start):
+    """Record the time elapsed since `start`, as returned by
+    `time.perf_counter`, as the duration of the startup `phase`.
+
+    """
+    elapsed = time.perf_counter() - start
+    _STARTUP_TIMES[phase] = elapsed
+    LOGGER.debug(f":startup-time {phase} {elapsed:.3f}s")
+
+
+def startup_report():
+    """Return a dict of the startup phases that have run so far, such as
+    "basilisp-init", to the time in seconds they took.
+
+    """
+    return dict(_STARTUP_TIMES)
+
+
+def init(precompiled_dir=None):
+    """Initialize the Basilisp runtime, unless it is already
+    initialized.
+
+    If `precompiled_dir` is provided, the precompiled namespaces bundle
+    found there is loaded first, see `basilisp_blender.precompiled`.
+
+    """
+    with _INIT_LOCK:
+        if precompiled_dir is not None:
+            from basilisp_blender import precompiled
+
+            start = time.perf_counter()
+            precompiled.bundle_load(precompiled_dir)
+            startup_time_record("precompiled-load", start)
+
+        if "basilisp-init" not in _STARTUP_TIMES:
+            start = time.perf_counter()
+            basilisp.init(COMPILER_OPTS)
+            startup_time_record("basilisp-init", start)
+
+
+def control_panel_create(precompiled_dir=None):
     """Initialises and displays the nREPL server UI control panel. It
     returns a function to destroy the panel and settings, and stop the
     server if it is running.
 
+    `precompiled_dir` is passed over to `init`, of which see.
+
     """
+    init(precompiled_dir)
+    start = time.perf_counter()
     ctrl_panel_mod = importlib.import_module(munge("basilisp-blender.control-panel"))
     panel = ctrl_panel_mod.nrepl_control_panel_create__BANG__()
+    startup_time_record("control-panel-create", start)
     return panel[Keyword("destroy!")]
-
-
@@ -0,0 +1,465 @@
+"""Run Basilisp jobs on a pool of warm background Blender processes.
+
+Each worker of a `BlenderPool` is a `blender --background` process
+running an nREPL server, started once and then sent job after job over
+nREPL. Before each job the worker scene is reset, either to the job's
+.blend file or to the factory startup file, so that jobs do not see
+each other's data while only paying for Blender and Basilisp startup
+once per worker.
+
+The pool can also be used from the command line, e.g.
+
+    python -m basilisp_blender.batch --workers 4 job1.lpy job2.lpy
+
+"""
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+from basilisp_blender import LOGGER
+
+# The Python code each Blender worker runs. Timers do not run in
+# background mode, so the worker's main thread executes the queued
+# nREPL requests itself, until its stdin is closed by the pool.
+_WORKER_SCRIPT = """
+import sys
+import threading
+
+from basilisp_blender import nrepl
+
+work_fn, shutdown_fn = nrepl.server_thread_async_start(nrepl_port_filepath={port_file!r})
+stop = threading.Event()
+
+def stdin_wait():
+    sys.stdin.read()
+    stop.set()
+
+threading.Thread(target=stdin_wait, daemon=True).start()
+try:
+    while not stop.is_set():
+        work_fn()
+        stop.wait({poll_sec!r})
+finally:
+    shutdown_fn()
+"""
+
+
+class JobError(Exception):
+    """Raised when a job throws an exception in its worker.
+
+    The `result` attribute holds the job's result dict, see
+    `BlenderPool.submit`, with the exception traceback under "ex".
+
+    """
+
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+
+class _Incomplete(Exception):
+    "Raised when decoding bencoded data that is not complete yet."
+
+
+def _bencode(value):
+    "Return the bencoded bytes of `value`."
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b"i%de" % value
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if isinstance(value, bytes):
+        return b"%d:%s" % (len(value), value)
+    if isinstance(value, (list, tuple)):
+        return b"l" + b"".join(_bencode(item) for item in value) + b"e"
+    if isinstance(value, dict):
+        items = sorted((k.encode("utf-8"), v) for k, v in value.items())
+        return b"d" + b"".join(_bencode(k) + _bencode(v) for k, v in items) + b"e"
+    raise TypeError(f"Cannot bencode value of type {type(value)}")
+
+
+def _bdecode(data, index=0):
+    """Decode the bencoded value starting at `index` of the `data`
+    bytes, with strings decoded as UTF-8, and return it along with the
+    index right after it.
+
+    Raise `_Incomplete` if `data` ends before the value does.
+
+    """
+    if index >= len(data):
+        raise _Incomplete()
+    tag = data[index : index + 1]
+    if tag == b"i":
+        end = data.find(b"e", index)
+        if end < 0:
+            raise _Incomplete()
+        return int(data[index + 1 : end]), end + 1
+    if tag in (b"l", b"d"):
+        items = []
+        index += 1
+        while True:
+            if index >= len(data):
+                raise _Incomplete()
+            if data[index : index + 1] == b"e":
+                break
+            item, index = _bdecode(data, index)
+            items.append(item)
+        if tag == b"d":
+            items = dict(zip(items[::2], items[1::2]))
+        return items, index + 1
+    colon = data.find(b":", index)
+    if colon < 0:
+        raise _Incomplete()
+    end = colon + 1 + int(data[index:colon])
+    if end > len(data):
+        raise _Incomplete()
+    return data[colon + 1 : end].decode("utf-8"), end
+
+
+def _lpy_str(value):
+    "Return the Basilisp string literal of the `value` string."
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _job_code(script, args):
+    """Return the Basilisp code to load the `script` file with
+    `*command-line-args*` bound to the `args` strings.
+
+    """
+    args_code = " ".join(_lpy_str(str(arg)) for arg in args)
+    return (
+        f"(binding [*command-line-args* [{args_code}]]"
+        f" (load-file {_lpy_str(os.path.abspath(script))}))"
+    )
+
+
+def _reset_code(blend_file):
+    """Return the Basilisp code to reset the scene to the `blend_file`, or
+    to the factory startup file if it is None.
+
+    """
+    if blend_file:
+        load = (
+            f"(.open-mainfile bpy.ops/wm ** :filepath"
+            f" {_lpy_str(os.path.abspath(blend_file))} :load-ui false)"
+        )
+    else:
+        load = "(.read-homefile bpy.ops/wm ** :use-factory-startup true :load-ui false)"
+    return f"(import bpy) {load} nil"
+
+
+class BlenderWorker:
+    """A background Blender process running an nREPL server, started
+    from the `blender_path` executable with `start`, and a client
+    connection to it to evaluate Basilisp code with `eval`.
+
+    `index` identifies the worker in results and errors. The process is
+    given `startup_timeout_sec` to start, and executes nREPL requests
+    every `poll_sec` while idle.
+
+    """
+
+    def __init__(self, blender_path, index=0, startup_timeout_sec=60, poll_sec=0.002):
+        self.index = index
+        self.blender_path = blender_path
+        self.startup_timeout_sec = startup_timeout_sec
+        self.poll_sec = poll_sec
+        self.process = None
+        self.sock = None
+        self.buffer = b""
+        self.last_id = 0
+        self.tmpdir = None
+
+    def start(self):
+        "Start the Blender process and connect to its nREPL server."
+        self.tmpdir = tempfile.mkdtemp(prefix="basilisp-blender-batch-")
+        port_file = os.path.join(self.tmpdir, ".nrepl-port")
+        script = _WORKER_SCRIPT.format(port_file=port_file, poll_sec=self.poll_sec)
+        log_file = os.path.join(self.tmpdir, "blender.log")
+        with open(log_file, "w") as log:
+            self.process = subprocess.Popen(
+                [
+                    self.blender_path,
+                    "--background",
+                    "--factory-startup",
+                    "-noaudio",
+                    "--python-expr",
+                    script,
+                ],
+                stdin=subprocess.PIPE,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+
+        deadline = time.monotonic() + self.startup_timeout_sec
+        while not os.path.exists(port_file):
+            if self.process.poll() is not None:
+                with open(log_file) as f:
+                    output = f.read()[-2000:]
+                raise RuntimeError(f"Worker {self.index} exited on startup:\n{output}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Worker {self.index} not started within {self.startup_timeout_sec}s"
+                )
+            time.sleep(0.05)
+        # the port file might be seen before its contents are written
+        port = None
+        while not port:
+            with open(port_file) as f:
+                port = f.read().strip()
+        self.sock = socket.create_connection(("127.0.0.1", int(port)))
+        self.buffer = b""
+        LOGGER.debug(f":batch-worker-started {self.index} :port {port}")
+
+    def stop(self, kill=False):
+        """Stop the Blender process, closing its stdin for it to exit, or
+        killing it if `kill` is true.
+
+        """
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        if self.process:
+            try:
+                if kill:
+                    self.process.kill()
+                self.process.stdin.close()
+                self.process.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            self.tmpdir = None
+
+    def _recv(self):
+        "Return the next message received from the nREPL server."
+        while True:
+            try:
+                message, index = _bdecode(self.buffer)
+                self.buffer = self.buffer[index:]
+                return message
+            except _Incomplete:
+                data = self.sock.recv(65536)
+                if not data:
+                    raise ConnectionError(f"Worker {self.index} connection closed")
+                self.buffer += data
+
+    def eval(self, code, timeout_sec=None):
+        """Evaluate the Basilisp `code` in the "user" namespace, within
+        `timeout_sec` if given, and return a dict of its result, see
+        `BlenderPool.submit`.
+
+        """
+        self.last_id += 1
+        self.sock.settimeout(timeout_sec)
+        self.sock.sendall(
+            _bencode({"op": "eval", "code": code, "ns": "user", "id": self.last_id})
+        )
+        result = {"value": None, "out": "", "err": "", "ex": None}
+        while True:
+            message = self._recv()
+            for key in ("out", "err"):
+                if key in message:
+                    result[key] += message[key]
+            for key in ("value", "ex"):
+                if key in message:
+                    result[key] = message[key]
+            if "done" in message.get("status", []):
+                return result
+
+    def reset(self, blend_file=None, timeout_sec=None):
+        """Reset the scene to the `blend_file`, or to the factory startup
+        file if it is None, and return the result dict of the reset.
+
+        """
+        return self.eval(_reset_code(blend_file), timeout_sec)
+
+    def run(self, script, blend_file, args, timeout_sec):
+        """Reset the scene to `blend_file` and load the `script` with the
+        `args`, returning the result dict of the latter.
+
+        """
+        start = time.perf_counter()
+        reset = self.reset(blend_file, timeout_sec)
+        result = reset if reset["ex"] else self.eval(_job_code(script, args), timeout_sec)
+        result.update(
+            {
+                "script": script,
+                "worker": self.index,
+                "elapsed_sec": time.perf_counter() - start,
+            }
+        )
+        return result
+
+
+class BlenderPool:
+    """A pool of `workers` background Blender processes, each started
+    from the `blender_path` executable, for running Basilisp jobs in
+    parallel, see `submit`.
+
+    `workers` defaults to the number of CPUs, and `blender_path` to the
+    `blender` executable found in the PATH. The `basilisp_blender`
+    package must be installed in Blender's Python environment.
+
+    A worker is given `startup_timeout_sec` to start, and each job
+    `job_timeout_sec` to complete, if provided. A worker that exits,
+    or times out on a job, is restarted for the next job.
+
+    The pool should be closed with `close` once done, or used as a
+    context manager.
+
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        blender_path=None,
+        startup_timeout_sec=60,
+        job_timeout_sec=None,
+        poll_sec=0.002,
+    ):
+        blender_path = blender_path or shutil.which("blender")
+        if not blender_path:
+            raise ValueError("Blender executable not found, set `blender_path`")
+        self.job_timeout_sec = job_timeout_sec
+        self._jobs = queue.Queue()
+        self._threads = []
+        for index in range(workers or os.cpu_count() or 1):
+            worker = BlenderWorker(blender_path, index, startup_timeout_sec, poll_sec)
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(worker,),
+                name=f"basilisp-blender-batch-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker_loop(self, worker):
+        "Run the jobs of the queue on `worker` until a None job is seen."
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                future, script, blend_file, args = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if worker.process is None:
+                        worker.start()
+                    result = worker.run(script, blend_file, args, self.job_timeout_sec)
+                except Exception as e:
+                    LOGGER.debug(f":batch-worker-error {worker.index} {e!r}")
+                    worker.stop(kill=True)
+                    future.set_exception(e)
+                    continue
+                if result["ex"]:
+                    message = (result["err"].strip().splitlines() or [""])[-1]
+                    future.set_exception(
+                        JobError(f"Job {script} failed: {message}", result)
+                    )
+                else:
+                    future.set_result(result)
+        finally:
+            worker.stop()
+
+    def submit(self, script, blend_file=None, args=()):
+        """Queue the Basilisp `script` file to be loaded by the next free
+        worker, after resetting its scene to the `blend_file`, or to the
+        factory startup file if not provided, with
+        `*command-line-args*` bound to the `args` strings.
+
+        Return a `concurrent.futures.Future` of a dict with the job's
+        result
+
+        "value" The printed value of the script's last form.
+
+        "out" and "err" The script's output to `*out*` and to `*err*`.
+
+        "ex" The traceback of the exception thrown by the script, in
+        which case the future raises a `JobError` instead.
+
+        "script", "worker" and "elapsed_sec" The script, the index of
+        the worker it ran on and the time in seconds it took including
+        the scene reset.
+
+        """
+        future = Future()
+        self._jobs.put((future, script, blend_file, tuple(args)))
+        return future
+
+    def close(self):
+        """Wait for the queued jobs to complete, then stop the workers."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    """Run the Basilisp scripts given on the command line on a
+    `BlenderPool`, printing the result of each as a JSON line in
+    submission order. Return 1 if any of them failed, 0 otherwise.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m basilisp_blender.batch",
+        description="Run Basilisp scripts on a pool of background Blender processes.",
+    )
+    parser.add_argument("scripts", nargs="+", help="the .lpy scripts to run")
+    parser.add_argument("--workers", type=int, help="the number of Blender processes")
+    parser.add_argument("--blender", help="the path to the Blender executable")
+    parser.add_argument("--blend", help="the .blend file to open before each script")
+    parser.add_argument("--timeout", type=float, help="the time limit of each script")
+    parser.add_argument(
+        "--arg",
+        action="append",
+        default=[],
+        help="an argument to pass to every script, can be repeated",
+    )
+    options = parser.parse_args(argv)
+
+    failed = False
+    with BlenderPool(
+        workers=options.workers,
+        blender_path=options.blender,
+        job_timeout_sec=options.timeout,
+    ) as pool:
+        futures = [
+            pool.submit(script, options.blend, options.arg) for script in options.scripts
+        ]
+        for script, future in zip(options.scripts, futures):
+            try:
+                result = future.result()
+            except JobError as e:
+                failed = True
+                result = e.result
+            except Exception as e:
+                failed = True
+                result = {"script": script, "error": repr(e)}
+            print(json.dumps(result), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
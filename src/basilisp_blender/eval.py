@@ -1,48 +1,679 @@
 """Functions for evaluating Basilisp code."""
 
+import cProfile
+import hashlib
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from importlib.metadata import version
+from pathlib import Path
+
 from basilisp import cli
 from basilisp import main as basilisp
-from basilisp.lang import compiler, runtime
+from basilisp.lang import compiler, reader, runtime
+from basilisp.lang import keyword as kw
+from basilisp.lang import symbol as sym
+from basilisp.lang.interfaces import (
+    IPersistentMap,
+    IPersistentSet,
+    IPersistentVector,
+    ISeq,
+)
 
-from basilisp_blender import COMPILER_OPTS
+from basilisp_blender import COMPILER_OPTS, LOGGER, init, startup_time_record
 
 # the namesapce where the command will be evaluated at
 EVALUATION_NS_ = "blender-user"
 
 CTX_ = compiler.CompilerContext(filename="blender", opts=COMPILER_OPTS)
-NS_VAR_ = runtime.set_current_ns(EVALUATION_NS_)
+# the `*ns*` var, set up on first use by `_ns_var_get`
+NS_VAR_ = None
+_NS_LOCK = threading.Lock()
+# whether `*ns*` is bound to the evaluation namespace in the thread
+_NS_THREAD = threading.local()
 EOF_ = object()
 
+# the default maximum number of code strings `eval_str` keeps compiled
+EVAL_CACHE_MAXSIZE = 128
+
+# the prefix of the function names the compiler wraps each form into
+WRAPPED_FN_PREFIX_ = "__bblender_expr__"
+
+
+def _ns_var_get():
+    """Return the `*ns*` var, initializing the Basilisp runtime and
+    setting up the namespace for command evaluation on first use.
+
+    `*ns*` is bound per thread, so it is bound to the evaluation
+    namespace on each thread's first use, wherever the runtime was
+    initialized from.
+
+    """
+    global NS_VAR_
+    if NS_VAR_ is None:
+        with _NS_LOCK:
+            if NS_VAR_ is None:
+                init()
+                start = time.perf_counter()
+                ns_var = runtime.set_current_ns(EVALUATION_NS_)
+                cli.eval_str(
+                    f"(ns {EVALUATION_NS_} (:require clojure.core))",
+                    CTX_,
+                    ns_var.value,
+                    EOF_,
+                )
+                _NS_THREAD.bound = True
+                NS_VAR_ = ns_var
+                startup_time_record("eval-ns-init", start)
+    if not getattr(_NS_THREAD, "bound", False):
+        runtime.set_current_ns(EVALUATION_NS_)
+        _NS_THREAD.bound = True
+    return NS_VAR_
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# A compiled code string, with `codes` the list of (bytecode,
+# wrapped-fn-name) pairs for each top level form and `resolved` the
+# tuple of (symbol, var, root) triples of the symbols in the forms,
+# with the var each resolved to, or None, and its root at the end of
+# their last execution.
+_CacheEntry = namedtuple("_CacheEntry", ["codes", "resolved"])
+
+
+class _EvalCache:
+    """An LRU cache of code strings compiled into Python bytecode, keyed
+    by the namespace name and the hash of the code.
+
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self.entries.clear()
+
+    def get(self, key, ns):
+        """Return the entry for `key` if its symbols still resolve in
+        `ns` to the same vars and none of them has been redefined,
+        otherwise discard it and return None.
+
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            if all(
+                runtime.resolve_var(s, ns) is var and (var is None or var.root is root)
+                for s, var, root in entry.resolved
+            ):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+_EVAL_CACHE = _EvalCache(EVAL_CACHE_MAXSIZE)
+
+
+def _form_symbols(form):
+    """Yield all the symbols found in the `form` tree."""
+    if isinstance(form, sym.Symbol):
+        yield form
+    elif isinstance(form, IPersistentMap):
+        for k, v in form.items():
+            yield from _form_symbols(k)
+            yield from _form_symbols(v)
+    elif isinstance(form, (ISeq, IPersistentVector, IPersistentSet)):
+        for f in form:
+            yield from _form_symbols(f)
+
+
+def _vars_resolve(symbols, ns):
+    """Return a tuple of the vars the `symbols` resolve to in `ns`."""
+    found = set()
+    for s in symbols:
+        var = runtime.resolve_var(s, ns)
+        if var is not None:
+            found.add(var)
+    return tuple(found)
+
+
+def _symbols_resolve(symbols, ns):
+    """Return a tuple of (symbol, var, root) triples of the `symbols`,
+    the var each resolves to in `ns`, or None, and its root.
+
+    """
+    resolved = []
+    for s in symbols:
+        var = runtime.resolve_var(s, ns)
+        resolved.append((s, var, None if var is None else var.root))
+    return tuple(resolved)
+
+
+def _compile_and_exec(code, ns):
+    """Read, compile and execute the `code` string in `ns`, and return
+    a tuple of the result and a `_CacheEntry` for it.
+
+    """
+    last = EOF_
+    codes = []
+    symbols = set()
+    for form in reader.read_str(code, resolver=runtime.resolve_alias, eof=EOF_):
+        assert not isinstance(form, reader.ReaderConditional)
+        symbols.update(_form_symbols(form))
+        last, form_codes = _form_compile_and_exec(form, CTX_, ns)
+        codes.extend(form_codes)
+    return last, _CacheEntry(codes, _symbols_resolve(symbols, ns))
+
+
+def _form_compile_and_exec(form, ctx, ns):
+    """Compile and execute the top level `form` in `ns` with `ctx`, and
+    return a tuple of the result and the list of (bytecode,
+    wrapped-fn-name) pairs it was compiled into.
 
-def eval_str(code):
+    """
+    bytecodes = []
+    result = compiler.compile_and_exec_form(
+        form,
+        ctx,
+        ns,
+        wrapped_fn_name=WRAPPED_FN_PREFIX_,
+        collect_bytecode=bytecodes.append,
+    )
+    codes = []
+    for bytecode in bytecodes:
+        (fn_name,) = [n for n in bytecode.co_names if n.startswith(WRAPPED_FN_PREFIX_)]
+        codes.append((bytecode, fn_name))
+    return result, codes
+
+
+def _bytecode_exec(bytecode, fn_name, module_dict):
+    """Execute the `bytecode` of a top level form in `module_dict`, and
+    return the result of calling the `fn_name` function it defines.
+
+    """
+    exec(bytecode, module_dict)  # pylint: disable=exec-used
+    try:
+        return module_dict[fn_name]()
+    finally:
+        del module_dict[fn_name]
+
+
+def _exec(entry, ns):
+    """Execute the bytecode of the cache `entry` in `ns` and return the
+    result of the last form.
+
+    """
+    last = EOF_
+    module_dict = ns.module.__dict__
+    for bytecode, fn_name in entry.codes:
+        last = _bytecode_exec(bytecode, fn_name, module_dict)
+    return last
+
+
+def eval_str(code, cache=True):
     """Evaluate the given `code` string in Basilisp and return the
     result.
 
+    The code is compiled into Python bytecode which is kept in an LRU
+    cache keyed by the namespace and the hash of the `code`, so that
+    evaluating the same code again only executes it. A cache entry is
+    discarded when any of the vars its code references is redefined,
+    or any of its symbols resolves to a different var, e.g. when a
+    referred var is shadowed.
+    Set `cache` to False to bypass the cache.
+
+    """
+    ns = _ns_var_get().value
+    if not cache or _EVAL_CACHE.maxsize <= 0:
+        return cli.eval_str(code, CTX_, ns, EOF_)
+
+    key = (ns.name, hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest())
+    entry = _EVAL_CACHE.get(key, ns)
+    if entry is None:
+        result, entry = _compile_and_exec(code, ns)
+    else:
+        result = _exec(entry, ns)
+        entry = entry._replace(
+            resolved=tuple(
+                (s, var, None if var is None else var.root)
+                for s, var, _ in entry.resolved
+            )
+        )
+    _EVAL_CACHE.put(key, entry)
+    return result
+
+
+def eval_cache_info():
+    """Return a `CacheInfo` named tuple with the `eval_str` cache
+    `hits`, `misses`, `maxsize` and current size `currsize`.
+
+    """
+    return CacheInfo(
+        _EVAL_CACHE.hits,
+        _EVAL_CACHE.misses,
+        _EVAL_CACHE.maxsize,
+        len(_EVAL_CACHE.entries),
+    )
+
+
+def eval_cache_clear(maxsize=None):
+    """Clear the `eval_str` cache and its statistics, and optionally set
+    its `maxsize`. A `maxsize` of 0 disables the cache.
+
+    """
+    _EVAL_CACHE.clear()
+    if maxsize is not None:
+        _EVAL_CACHE.maxsize = maxsize
+
+
+# the file name of the profile statistics dumped by `eval_str_profile`
+PROFILE_FILENAME = "basilisp-blender.prof"
+
+
+def _profile_top(stats, top, sort):
+    """Return a list of a dict for each of the `top` functions of the
+    `pstats.Stats` `stats` ordered by the `sort` key, with their
+    "function" name, "file", "line", number of calls "ncalls", and own
+    "tottime_ms" and cumulative "cumtime_ms" time in milliseconds.
+
+    The functions of this module are left out.
+
+    """
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        if filename == __file__:
+            continue
+        rows.append(
+            {
+                "function": name,
+                "file": filename,
+                "line": line,
+                "ncalls": ncalls,
+                "tottime_ms": tottime * 1000,
+                "cumtime_ms": cumtime * 1000,
+            }
+        )
+    key = "tottime_ms" if sort == "tottime" else "cumtime_ms"
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return rows[:top]
+
+
+def _profile_dump(stats, prof_dir):
+    """Dump the profile `stats` to `PROFILE_FILENAME` in `prof_dir`, if
+    not None, and return the path to the file.
+
+    """
+    if prof_dir is None:
+        return None
+    prof_file = os.path.join(prof_dir, PROFILE_FILENAME)
+    stats.dump_stats(prof_file)
+    return prof_file
+
+
+def eval_str_profile(code, top=20, sort="tottime", prof_dir=None, ns=None):
+    """Evaluate the given `code` string in Basilisp under `cProfile`,
+    bypassing the `eval_str` cache so that its compilation is profiled
+    too, and return a dict with the following keys
+
+    "result" The result of the evaluation.
+
+    "compile_ms" The time in milliseconds spent reading and compiling
+    the code, including macroexpansion.
+
+    "run_ms" The time in milliseconds spent running the compiled code.
+
+    "top" The `top` hot functions, ordered by their own "tottime" (the
+    default) or "cumulative" time as given by `sort`, see
+    `_profile_top`.
+
+    "prof_file" The path to the profile statistics file dumped in
+    `prof_dir`, if provided, which can be loaded with `pstats` or
+    viewed with tools such as snakeviz.
+
+    The code is evaluated in the `ns` namespace if given, or in the
+    namespace `eval_str` uses. Exceptions thrown by the code are
+    raised after the profiler is stopped.
+
+    """
+    ns = ns or _ns_var_get().value
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        result, _ = _compile_and_exec(code, ns)
+    finally:
+        profiler.disable()
+    total_ms = (time.perf_counter() - start) * 1000
+
+    stats = pstats.Stats(profiler)
+    run_ms = 1000 * sum(
+        cumtime
+        for (_, _, name), (_, _, _, cumtime, _) in stats.stats.items()
+        if name.startswith(WRAPPED_FN_PREFIX_)
+    )
+    return {
+        "result": result,
+        "compile_ms": max(total_ms - run_ms, 0.0),
+        "run_ms": run_ms,
+        "top": _profile_top(stats, top, sort),
+        "prof_file": _profile_dump(stats, prof_dir),
+    }
+
+
+def fn_profile(f, top=20, sort="tottime", prof_dir=None):
+    """Call the `f` function with no arguments under `cProfile` and
+    return a dict of its "result", the "run_ms" time in milliseconds
+    spent running it, and the "top" hot functions and "prof_file" as
+    in `eval_str_profile`.
+
+    Exceptions thrown by `f` are raised after the profiler is stopped.
+
+    """
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    result = profiler.runcall(f)
+    run_ms = (time.perf_counter() - start) * 1000
+
+    stats = pstats.Stats(profiler)
+    return {
+        "result": result,
+        "run_ms": run_ms,
+        "top": _profile_top(stats, top, sort),
+        "prof_file": _profile_dump(stats, prof_dir),
+    }
+
+
+# A top level form evaluated by `eval_str_incremental`, with `defines`
+# the vars it (re)defined and `refs` the vars it references.
+_FormRecord = namedtuple("_FormRecord", ["defines", "refs"])
+
+# A map of the `eval_str_incremental` keys to a dict of the source hash
+# of each form last evaluated to its `_FormRecord`.
+_INCREMENTAL_STATE = {}
+
+
+def _forms_with_source(code):
+    """Yield a (form, source) tuple for each top level form read from
+    `code`. The source of forms without position information, such as
+    keywords or numbers, is their printed representation.
+
+    """
+    line_offsets = [0]
+    for line in code.splitlines(keepends=True):
+        line_offsets.append(line_offsets[-1] + len(line))
+
+    for form in reader.read_str(code, resolver=runtime.resolve_alias):
+        assert not isinstance(form, reader.ReaderConditional)
+        meta = getattr(form, "meta", None)
+        if meta is not None and reader.READER_END_LINE_KW in meta:
+            start = line_offsets[meta[reader.READER_LINE_KW] - 1] + meta[reader.READER_COL_KW]
+            end = (
+                line_offsets[meta[reader.READER_END_LINE_KW] - 1]
+                + meta[reader.READER_END_COL_KW]
+            )
+            yield form, code[start:end]
+        else:
+            yield form, repr(form)
+
+
+def _interns_roots(ns):
+    """Return a dict of the vars interned in `ns` to their root."""
+    return {var: var.root for var in ns.interns.values()}
+
+
+def _ns_form_p(form):
+    """Return whether `form` is an `ns` or `in-ns` form, which changes
+    the namespace the forms after it are evaluated in.
+
     """
-    return cli.eval_str(code, CTX_, NS_VAR_.value, EOF_)
+    if not isinstance(form, ISeq) or not isinstance(form.first, sym.Symbol):
+        return False
+    head = form.first
+    return head.name in ("ns", "in-ns") and head.ns in (None, "basilisp.core")
+
+
+def eval_str_incremental(code, key):
+    """Evaluate only the top level forms of the given `code` string
+    that have changed since the last evaluation under `key`, and return
+    the result of the last form evaluated, or None if none were.
 
+    A form is considered changed if its source was not part of the last
+    evaluation in the same namespace, or if it references a var
+    (re)defined by another changed form evaluated before it. `ns` and
+    `in-ns` forms are always evaluated, so that the forms after them
+    are evaluated in and resolved against their namespace. All the
+    forms are evaluated on the first evaluation under `key`, or after
+    `eval_incremental_reset`.
+
+    """
+    ns_var = _ns_var_get()
+    records_prev = _INCREMENTAL_STATE.get(key, {})
+    records = {}
+    changed = set()
+    result = None
+    evaluated = 0
+    try:
+        for form, source in _forms_with_source(code):
+            ns = ns_var.value
+            digest = hashlib.blake2b(
+                f"{ns.name}\0{source}".encode("utf-8"), digest_size=16
+            ).digest()
+            record = records_prev.get(digest)
+            if (
+                record is not None
+                and not _ns_form_p(form)
+                and not (record.refs & changed)
+            ):
+                records[digest] = record
+                continue
 
-def eval_file(filepath):
+            roots = _interns_roots(ns)
+            result = compiler.compile_and_exec_form(form, CTX_, ns)
+            evaluated += 1
+            ns_after = ns_var.value
+            if ns_after is ns:
+                defines = frozenset(
+                    var for var, root in _interns_roots(ns).items()
+                    if var not in roots or roots[var] is not root
+                )
+            else:
+                defines = frozenset()
+            changed |= defines
+            records[digest] = _FormRecord(
+                defines, frozenset(_vars_resolve(_form_symbols(form), ns_after))
+            )
+    finally:
+        _INCREMENTAL_STATE[key] = records
+        LOGGER.debug(f":eval-incremental {key} :evaluated {evaluated} :forms {len(records)}")
+    return result
+
+
+def eval_incremental_reset(key=None):
+    """Forget the forms evaluated by `eval_str_incremental` under `key`,
+    or under all keys if `key` is not given.
+
+    """
+    if key is None:
+        _INCREMENTAL_STATE.clear()
+    else:
+        _INCREMENTAL_STATE.pop(key, None)
+
+
+# the header of the `eval_file` bytecode cache files
+FILE_CACHE_MAGIC_ = b"BBLC\x01\r\n"
+
+
+def file_cache_path(filepath, cache_dir=None):
+    """Return the path of the bytecode cache file of the Basilisp
+    `filepath` used by `eval_file`.
+
+    The cache file is placed in the `__pycache__` directory next to
+    `filepath`, or in `cache_dir` if provided.
+
+    """
+    path = Path(filepath).resolve()
+    name = f"{path.stem}.{sys.implementation.cache_tag}.blender.lpyc"
+    if cache_dir is None:
+        return path.parent / "__pycache__" / name
+    else:
+        # disambiguate same named files from different directories
+        dir_hash = hashlib.blake2b(str(path.parent).encode("utf-8"), digest_size=8)
+        return Path(cache_dir) / f"{dir_hash.hexdigest()}-{name}"
+
+
+def _file_cache_key(source):
+    """Return the cache key of the `source` file contents, taking into
+    account the Basilisp version and the compiler options.
+
+    """
+    key = hashlib.blake2b(source, digest_size=32)
+    key.update(version("basilisp").encode("utf-8"))
+    key.update(repr(sorted((str(k), v) for k, v in COMPILER_OPTS.items())).encode("utf-8"))
+    return key.digest()
+
+
+def _file_cache_read(cache_path, key):
+    """Return the list of (ns-name, bytecode, wrapped-fn-name) tuples
+    stored in `cache_path` if it was created with `key`, or None
+    otherwise.
+
+    """
+    try:
+        with open(cache_path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    header = FILE_CACHE_MAGIC_ + key
+    if not data.startswith(header):
+        LOGGER.debug(f":eval-file-cache-stale {cache_path}")
+        return None
+    try:
+        return marshal.loads(data[len(header) :])  # nosec
+    except (EOFError, ValueError, TypeError) as e:
+        LOGGER.debug(f":eval-file-cache-corrupt {cache_path} {e}")
+        return None
+
+
+def _file_cache_write(cache_path, key, codes):
+    """Write the list of (ns-name, bytecode, wrapped-fn-name) `codes`
+    tuples to `cache_path` under `key`. Failures are logged and
+    otherwise ignored.
+
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(FILE_CACHE_MAGIC_ + key + marshal.dumps(codes))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        LOGGER.warning(f":eval-file-cache-write-error {cache_path} {e}")
+
+
+def _ns_bootstrapped_get(ns_name, ctx):
+    """Return the namespace named `ns_name`, bootstrapping its module
+    first if necessary.
+
+    """
+    ns = runtime.Namespace.get_or_create(sym.symbol(ns_name))
+    if not ns.module.__basilisp_bootstrapped__:
+        # the compiler bootstraps the module on the first form it
+        # evaluates in it.
+        compiler.compile_and_exec_form(kw.keyword("bootstrap"), ctx, ns)
+    return ns
+
+
+def _file_eval_cached(path, cache_dir):
+    """Evaluate the Basilisp code in the `path` file using or creating
+    its bytecode cache file in `cache_dir`, see `eval_file`.
+
+    """
+    ns_var = _ns_var_get()
+    source = path.read_bytes()
+    key = _file_cache_key(source)
+    cache_path = file_cache_path(path, cache_dir)
+    ctx = compiler.CompilerContext(filename=str(path.resolve()), opts=COMPILER_OPTS)
+
+    codes = _file_cache_read(cache_path, key)
+    if codes is not None:
+        LOGGER.debug(f":eval-file-cache-hit {cache_path}")
+        last = None
+        for ns_name, bytecode, fn_name in codes:
+            ns = _ns_bootstrapped_get(ns_name, ctx)
+            last = _bytecode_exec(bytecode, fn_name, ns.module.__dict__)
+        return last
+
+    LOGGER.debug(f":eval-file-cache-miss {cache_path}")
+    last = None
+    codes = []
+    for form in reader.read_file(str(path), resolver=runtime.resolve_alias):
+        assert not isinstance(form, reader.ReaderConditional)
+        # forms are evaluated in the current namespace as in
+        # `basilisp.core/load-file`.
+        ns = ns_var.value
+        last, form_codes = _form_compile_and_exec(form, ctx, ns)
+        codes.extend((str(ns.name), bytecode, fn_name) for bytecode, fn_name in form_codes)
+    _file_cache_write(cache_path, key, codes)
+    return last
+
+
+def eval_file(filepath, cache=False, cache_dir=None):
     """Evaluate the Basilisp code from the file specified by
     `filepath`.
 
+    If `cache` is True, the top level forms are compiled into Python
+    bytecode which is stored in a cache file and reused in later
+    evaluations of the same file contents, Basilisp version and
+    compiler options. The cache file is placed in the `__pycache__`
+    directory next to `filepath`, or in `cache_dir` if provided, see
+    `file_cache_path`.
+
     """
-    return cli.eval_file(filepath, CTX_, NS_VAR_.value)
+    if not cache:
+        return cli.eval_file(filepath, CTX_, _ns_var_get().value)
 
+    path = Path(filepath)
+    if not path.exists():
+        raise FileNotFoundError(f"Error: The file {filepath} does not exist.")
+    return _file_eval_cached(path, cache_dir)
 
-# Set up the Basilisp namespace for command evaluation
-eval_str(f"(ns {EVALUATION_NS_} (:require clojure.core))")
 
 try:
     import bpy
 
-    def eval_editor(text_block):
+    def eval_editor(text_block, cache=True, incremental=False):
         """Evaluate the Basilisp code contained in the specified
         Blender Text Editor `text_block` and return the result.
 
+        The compiled code is cached as in `eval_str`, of which see.
+
+        If `incremental` is True, only the top level forms that have
+        changed since the last incremental evaluation of the
+        `text_block` are evaluated, see `eval_str_incremental`.
+
         """
         code = bpy.data.texts[text_block].as_string()
-        return eval_str(code)
+        if incremental:
+            return eval_str_incremental(code, text_block)
+        return eval_str(code, cache=cache)
 
 except ImportError:
     pass
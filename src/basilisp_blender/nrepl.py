@@ -8,6 +8,8 @@ from basilisp.lang import keyword as kw
 from basilisp.lang import map as lmap
 from basilisp.lang.util import munge
 
+from basilisp_blender import init
+
 def server_thread_async_start(host="127.0.0.1", port=0, nrepl_port_filepath=None):
     """Start an nREPL server on the specified `host` and `port` on a
     separate thread.
@@ -22,44 +24,113 @@ def server_thread_async_start(host="127.0.0.1", port=0, nrepl_port_filepath=None
     The port number is saved to the `nrepl_port_filepath` for nREPL
     clients to use, if provided.
 
+    """
+    server = _server_start(host, port, nrepl_port_filepath)
+    return server.get(kw.keyword("work-fn")), server.get(kw.keyword("shutdown-fn"))
+
+
+def _server_start(
+    host,
+    port,
+    nrepl_port_filepath,
+    eval_mode="main",
+    eval_limit_sec=None,
+    print_length=None,
+    print_level=None,
+):
+    """Start an nREPL server with `basilisp-blender.nrepl-work/server-start!`
+    and return its result map.
+
     """
     assert '"' not in host
     assert port >= 0
 
-    nrepl_server_mod = importlib.import_module(munge("basilisp-nrepl-async.nrepl-server"))
-    ret = nrepl_server_mod.server_start__BANG__(
+    init()
+    nrepl_work_mod = importlib.import_module(munge("basilisp-blender.nrepl-work"))
+    ret = nrepl_work_mod.server_start__BANG__(
         lmap.map(
             {
-                kw.keyword("async?"): True,
                 kw.keyword("host"): host,
                 kw.keyword("port"): port,
                 kw.keyword("nrepl-port-file"): nrepl_port_filepath,
+                kw.keyword("eval-mode"): kw.keyword(eval_mode),
+                kw.keyword("eval-limit-sec"): eval_limit_sec,
+                kw.keyword("print-length"): print_length,
+                kw.keyword("print-level"): print_level,
             }
         )
     )
 
     assert ret is not None, ":server-error :could-not-be-started"
+    assert ret.get(kw.keyword("error")) is None, f":server-error {ret}"
     work_fn = ret.get(kw.keyword("work-fn"))
     shutdown_fn = ret.get(kw.keyword("shutdown-fn"))
     assert work_fn and shutdown_fn, ":server-error :could-not-be-started"
 
-    return work_fn, shutdown_fn
+    return ret
 
 
 try:
     import bpy
 
     def server_start(
-        host="127.0.0.1", port=0, nrepl_port_filepath=".nrepl-port", interval_sec=0.1
+        host="127.0.0.1",
+        port=0,
+        nrepl_port_filepath=".nrepl-port",
+        interval_sec=0.1,
+        interval_min_sec=0.005,
+        interval_idle_sec=0.1,
+        active_sec=30,
+        backoff="exponential",
+        tick_budget_ms=None,
+        eval_mode="main",
+        eval_limit_sec=None,
+        print_length=None,
+        print_level=None,
+        print_summaries=False,
     ):
         """Start an nREPL server on a separate thread using the
         specified `host` and `port`. The server binds to "127.0.0.1"
         by default and uses a random port if `port` is set to 0 (the
-        default). Client requests are queued and executed at intervals
-        defined by `interval_sec` (defaulting to 0.1 seconds) using a
+        default). Client requests are queued and executed using a
         `bpy.app.timers` timer for thread safety. The server is also
         registered to shut down upon program exit.
 
+        The timer runs every `interval_min_sec` seconds (defaulting to
+        5ms) while there are client requests, and for `active_sec`
+        seconds (defaulting to 30) after the last one while clients are
+        connected, so that a request typed after a pause is picked up
+        at once. Otherwise, it backs off according to the `backoff`
+        policy ("exponential", "linear" or "none") up to `interval_sec`
+        seconds (defaulting to 0.1 seconds) while clients are
+        connected, or up to `interval_idle_sec` (defaulting to 0.1
+        seconds) while none are. Raising the latter saves idle wake-ups, but a new client's
+        first request can then wait for up to that long.
+
+        If `tick_budget_ms` is provided, each timer call stops executing
+        client requests once it has spent that many milliseconds, and
+        any requests left over are executed on the next call.
+
+        If `eval_mode` is "hybrid", client requests are instead
+        evaluated on a worker thread, and the timer only executes the
+        code wrapped in `basilisp-blender.nrepl-work/on-main`, which
+        any code using `bpy` should be.
+
+        If `eval_limit_sec` is provided, client requests running for
+        longer than that many seconds are interrupted with an
+        `EvalTimeoutError`. Requests can also be interrupted by their
+        client with an nREPL "interrupt" request.
+
+        If `print_length` or `print_level` are provided, client
+        requests are executed with `*print-length*` or `*print-level*`
+        bound to them, truncating their results to that many items per
+        collection or levels of nesting.
+
+        If `print_summaries` is True, `bpy` structs and collections are
+        printed as summaries of their type and name or length. This
+        applies to all Basilisp printing in the Blender process, not
+        only to the server's.
+
         The port number is saved to a file for nREPL clients to use. By
         default, this is an `.nrepl-port` file in the current working
         directory. If `nrepl_port_filepath` is provided, the port number is
@@ -67,18 +138,6 @@ try:
 
         """
 
-        def work_do_safe(workfn, interval_sec):
-            """Execute `workfn` return, `interval_sec` to indicate when to
-            call this function again, and catch exceptions to report errors to
-            stderr.
-
-            """
-            try:
-                workfn()
-            except Exception as e:
-                print(f":nrepl-work-fn-error {e}", file=sys.stderr)
-            return interval_sec
-
         def shutdown_safe(shutdownfn):
             """Execute `shutdownfn` and handle any exceptions by reporting
             errors to stderr.
@@ -89,13 +148,50 @@ try:
             except Exception as e:
                 print(f":nrepl-shutdown-error {e}", file=sys.stderr)
 
-        workfn, shutdownfn = server_thread_async_start(
-            host=host, port=port, nrepl_port_filepath=nrepl_port_filepath
+        server = _server_start(
+            host,
+            port,
+            nrepl_port_filepath,
+            eval_mode,
+            eval_limit_sec,
+            print_length,
+            print_level,
         )
+        if print_summaries:
+            bpy_utils_mod = importlib.import_module(munge("basilisp-blender.bpy-utils"))
+            bpy_utils_mod.print_summaries_install__BANG__()
+        shutdownfn = server.get(kw.keyword("shutdown-fn"))
 
         atexit.register(lambda: shutdown_safe(shutdownfn))
 
-        bpy.app.timers.register(lambda: work_do_safe(workfn, interval_sec))
+        nrepl_work_mod = importlib.import_module(munge("basilisp-blender.nrepl-work"))
+        timer_fn = nrepl_work_mod.timer_fn_make(
+            server,
+            lmap.map(
+                {
+                    kw.keyword("interval-min-sec"): interval_min_sec,
+                    kw.keyword("interval-max-sec"): interval_sec,
+                    kw.keyword("interval-idle-sec"): interval_idle_sec,
+                    kw.keyword("active-sec"): active_sec,
+                    kw.keyword("backoff"): kw.keyword(backoff),
+                    kw.keyword("tick-budget-ms"): tick_budget_ms,
+                }
+            ),
+        )
+
+        def timer_safe():
+            """Execute `timer_fn` and return the interval it requests to
+            be called again at, and catch exceptions to report errors
+            to stderr.
+
+            """
+            try:
+                return timer_fn()
+            except Exception as e:
+                print(f":nrepl-work-fn-error {e}", file=sys.stderr)
+                return interval_sec
+
+        bpy.app.timers.register(timer_safe)
 
         return shutdownfn
 
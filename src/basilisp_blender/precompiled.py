@@ -0,0 +1,268 @@
+"""Load Basilisp namespaces from a bundle of precompiled bytecode.
+
+A bundle is a directory with the bytecode of each compiled namespace
+and an index file describing them, created with `bundle_create`. Once
+loaded with `bundle_load`, namespaces are executed straight from the
+bundle whenever their source matches the one they were compiled from,
+regardless of file timestamps or write access to the install location.
+
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from importlib.metadata import version
+
+from basilisp import importer
+from basilisp.lang import compiler, runtime
+from basilisp.lang.util import munge
+
+from basilisp_blender import LOGGER
+
+# the name of the bundle index file
+BUNDLE_INDEX_FILENAME = "index.json"
+
+# The Basilisp importer internals the bundles rely on, which are not
+# part of its public API and may change in any release.
+_IMPORTER_INTERNALS = {
+    "MAGIC_NUMBER": importer,
+    "_get_basilisp_bytecode": importer,
+    "_w_long": importer,
+    "_exec_cached_module": importer.BasilispImporter,
+    "_exec_module": importer.BasilispImporter,
+    "_cache_bytecode": importer.BasilispImporter,
+}
+
+
+def _importer_internals_missing():
+    "Return the names of the Basilisp importer internals that are missing."
+    return [
+        name for name, obj in _IMPORTER_INTERNALS.items() if not hasattr(obj, name)
+    ]
+
+
+def _source_hash(data):
+    "Return the hex digest identifying the source code `data` bytes."
+    return hashlib.sha256(data).hexdigest()
+
+
+def _bundle_compat_get():
+    """Return the properties of the running environment a bundle must
+    have been created in to be loadable.
+
+    """
+    return {
+        "basilisp_version": version("basilisp"),
+        "cache_tag": sys.implementation.cache_tag,
+        "magic_number": getattr(importer, "MAGIC_NUMBER", b"").hex(),
+    }
+
+
+class BundleImporter(importer.BasilispImporter):
+    """A Basilisp importer that executes namespaces from precompiled
+    bundles, falling back to the standard bytecode cache or compilation
+    for any other namespace.
+
+    When `collect_dir` is set, it instead compiles every namespace it
+    imports from source and writes its bytecode to the bundle at
+    `collect_dir`.
+
+    """
+
+    def __init__(self, collect_dir=None):
+        super().__init__()
+        self.collect_dir = collect_dir
+        # namespace module name => (bundle dir, index entry)
+        self.bundled = {}
+        # source filename => namespace module name, while collecting
+        self._collecting = {}
+
+    def bundle_add(self, bundle_dir, namespaces):
+        """Make the `namespaces` entries of the bundle index at
+        `bundle_dir` available for loading.
+
+        """
+        for fullname, entry in namespaces.items():
+            self.bundled[fullname] = (bundle_dir, entry)
+
+    def _exec_cached_module(self, fullname, loader_state, path_stats, module):
+        if self.collect_dir is not None:
+            raise ImportError(f"Collecting {fullname}, skipping bytecode cache")
+
+        bundled = self.bundled.get(fullname)
+        if bundled is None:
+            return super()._exec_cached_module(
+                fullname, loader_state, path_stats, module
+            )
+
+        bundle_dir, entry = bundled
+        filename = loader_state["filename"]
+        source = self.get_data(filename)
+        if len(source) != entry["size"] or _source_hash(source) != entry["sha256"]:
+            LOGGER.debug(f":precompiled-source-changed {fullname} {filename}")
+            return super()._exec_cached_module(
+                fullname, loader_state, path_stats, module
+            )
+
+        cache_data = self.get_data(os.path.join(bundle_dir, entry["file"]))
+        cached_code = importer._get_basilisp_bytecode(
+            fullname, 0, entry["size"], cache_data
+        )
+        compiler.compile_bytecode(
+            cached_code,
+            compiler.GeneratorContext(
+                filename=filename, opts=runtime.get_compiler_opts()
+            ),
+            compiler.PythonASTOptimizer(),
+            module,
+        )
+        LOGGER.debug(f":precompiled-loaded {fullname}")
+
+    def _exec_module(self, fullname, loader_state, path_stats, module):
+        self._collecting[loader_state["filename"]] = fullname
+        return super()._exec_module(fullname, loader_state, path_stats, module)
+
+    def _cache_bytecode(self, source_path, cache_path, data):
+        fullname = self._collecting.pop(source_path, None)
+        if self.collect_dir is not None and fullname is not None:
+            # Bundled bytecode is validated against the source hash
+            # instead of its modification time, which is zeroed out.
+            data = bytes(data[:4]) + importer._w_long(0) + bytes(data[8:])
+            self.set_data(os.path.join(self.collect_dir, f"{fullname}.lpyc"), data)
+            return
+
+        try:
+            super()._cache_bytecode(source_path, cache_path, data)
+        except OSError as e:
+            # e.g. when installed in a read-only location.
+            LOGGER.debug(f":bytecode-cache-write-error {cache_path} {e}")
+
+
+def _importer_install(imp):
+    """Install `imp` in `sys.meta_path`, replacing any other Basilisp
+    importer in place.
+
+    """
+    for idx, finder in enumerate(sys.meta_path):
+        if isinstance(finder, importer.BasilispImporter):
+            sys.meta_path[idx] = imp
+            break
+    else:
+        sys.meta_path.insert(0, imp)
+
+
+def _importer_get():
+    """Return the installed `BundleImporter`, installing a new one if
+    there is none.
+
+    """
+    for finder in sys.meta_path:
+        if isinstance(finder, BundleImporter):
+            return finder
+    imp = BundleImporter()
+    _importer_install(imp)
+    return imp
+
+
+def bundle_load(bundle_dir):
+    """Load the precompiled bundle at `bundle_dir`, so that its
+    namespaces are executed from it on import.
+
+    This should be called before the Basilisp runtime is initialized
+    for `basilisp.core` to be loaded from the bundle as well.
+
+    Returns the number of namespaces made available, or 0 if there is
+    no bundle at `bundle_dir`, it was created for a different Python
+    or Basilisp version, or the running Basilisp version can not load
+    bundles, in which case namespaces are imported as usual.
+
+    """
+    missing = _importer_internals_missing()
+    if missing:
+        LOGGER.debug(
+            f":precompiled-unsupported {version('basilisp')} :missing {missing}"
+        )
+        return 0
+
+    index_path = os.path.join(bundle_dir, BUNDLE_INDEX_FILENAME)
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        LOGGER.debug(f":precompiled-index-unavailable {index_path} {e}")
+        return 0
+
+    compat = _bundle_compat_get()
+    mismatch = {
+        k: index.get(k) for k, v in compat.items() if index.get(k) != v
+    }
+    if mismatch:
+        LOGGER.debug(f":precompiled-incompatible {bundle_dir} {mismatch} {compat}")
+        return 0
+
+    namespaces = index["namespaces"]
+    _importer_get().bundle_add(os.path.abspath(bundle_dir), namespaces)
+    LOGGER.debug(f":precompiled-bundle-loaded {bundle_dir} :count {len(namespaces)}")
+    return len(namespaces)
+
+
+def bundle_create(bundle_dir, namespaces):
+    """Compile the Basilisp `namespaces` and all the namespaces they
+    require into a precompiled bundle at `bundle_dir`.
+
+    It must run in a fresh Python process for the same Python and
+    Basilisp versions as those the bundle is meant for, before the
+    Basilisp runtime is initialized, so that `basilisp.core` is
+    included in the bundle too.
+
+    Returns the bundle index.
+
+    Raises `RuntimeError` if the running Basilisp version can not
+    create bundles.
+
+    """
+    from basilisp_blender import init
+
+    missing = _importer_internals_missing()
+    if missing:
+        raise RuntimeError(
+            f"Basilisp {version('basilisp')} is not supported, missing: {missing}"
+        )
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    imp = BundleImporter(collect_dir=bundle_dir)
+    _importer_install(imp)
+    sys.dont_write_bytecode = False
+
+    start = time.perf_counter()
+    init()
+    for ns in namespaces:
+        importlib.import_module(munge(ns))
+
+    index = _bundle_compat_get()
+    index["namespaces"] = {}
+    for fullname, module in sorted(sys.modules.items()):
+        filename = getattr(module, "__file__", None)
+        lpyc = os.path.join(bundle_dir, f"{fullname}.lpyc")
+        if filename and os.path.isfile(lpyc):
+            with open(filename, mode="rb") as f:
+                source = f.read()
+            index["namespaces"][fullname] = {
+                "file": os.path.basename(lpyc),
+                "size": len(source),
+                "sha256": _source_hash(source),
+            }
+
+    with open(
+        os.path.join(bundle_dir, BUNDLE_INDEX_FILENAME), "w", encoding="utf-8"
+    ) as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+    LOGGER.info(
+        f":precompiled-bundle-created {bundle_dir} :count {len(index['namespaces'])}"
+        f" :elapsed {time.perf_counter() - start:.3f}s"
+    )
+    return index
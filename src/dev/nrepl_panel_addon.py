@@ -10,17 +10,91 @@ bl_info = {
 }
 
 # >>>###<<< Marker: Start Of Code
-from basilisp_blender import control_panel_create
+import os
+
+import bpy
+
 _DESTROY_FN = None
-def register():
+
+# The precompiled namespaces bundle shipped with the extension, if any.
+_PRECOMPILED_DIR = os.path.join(os.path.dirname(__file__), "precompiled")
+
+def _panel_create():
+    """Create the panel, initializing the Basilisp runtime on first use."""
     global _DESTROY_FN
+    from basilisp_blender import control_panel_create, startup_report
     print(f"nREPL Control Panel creating...")
-    _DESTROY_FN = control_panel_create()
-    print(f"nREPL Control Panel creating... done")
+    _DESTROY_FN = control_panel_create(precompiled_dir=_PRECOMPILED_DIR)
+    print(f"nREPL Control Panel creating... done :startup-times {startup_report()}")
+
+def _panel_warm_up():
+    """Create the panel in the background after startup, if enabled in
+    the add-on preferences.
+
+    """
+    addon = bpy.context.preferences.addons.get(__name__)
+    if _DESTROY_FN is None and addon and addon.preferences.warm_up:
+        _panel_create()
+
+class NREPLPanelPreferences(bpy.types.AddonPreferences):
+    bl_idname = __name__
+
+    warm_up: bpy.props.BoolProperty(
+        name="Load Basilisp after startup",
+        description="Load Basilisp in the background shortly after Blender starts up, instead of on the first server start",
+        default=False,
+    )
+
+    def draw(self, context):
+        self.layout.prop(self, "warm_up")
+
+class NREPLServerStartOperator(bpy.types.Operator):
+    """Load Basilisp and start the nREPL server"""
+    bl_idname = "object.nrepl_server_start_operator"
+    bl_label = "Start Server"
+
+    def execute(self, context):
+        if _DESTROY_FN is None:
+            try:
+                _panel_create()
+            except Exception as e:
+                self.report({"ERROR"}, f"nREPL Control Panel creation failed: {e}")
+                return {"CANCELLED"}
+        return bpy.ops.object.nrepl_server_operator()
+
+class NREPLServerStartPanel(bpy.types.Panel):
+    """Starts the server until Basilisp is loaded, after which the
+    control panel takes over.
+
+    """
+    bl_idname = "PROPERTIES_EDITOR_PT_nREPL_server_start"
+    bl_label = "Basilisp nREPL server"
+    bl_space_type = "PROPERTIES"
+    bl_region_type = "WINDOW"
+    bl_context = "output"
+
+    @classmethod
+    def poll(cls, context):
+        return _DESTROY_FN is None
+
+    def draw(self, context):
+        self.layout.operator(NREPLServerStartOperator.bl_idname, text="🚀 START SERVER")
+
+_CLASSES = (NREPLPanelPreferences, NREPLServerStartOperator, NREPLServerStartPanel)
+
+def register():
+    for cls in _CLASSES:
+        bpy.utils.register_class(cls)
+    bpy.app.timers.register(_panel_warm_up, first_interval=1.0, persistent=True)
 
 def unregister():
     global _DESTROY_FN
-    print("nREPL Control Panel destroying...")
-    _DESTROY_FN()
-    _DESTROY_FN = None
-    print("nREPL Control Panel destroying... done")
+    if bpy.app.timers.is_registered(_panel_warm_up):
+        bpy.app.timers.unregister(_panel_warm_up)
+    for cls in reversed(_CLASSES):
+        bpy.utils.unregister_class(cls)
+    if _DESTROY_FN:
+        print("nREPL Control Panel destroying...")
+        _DESTROY_FN()
+        _DESTROY_FN = None
+        print("nREPL Control Panel destroying... done")
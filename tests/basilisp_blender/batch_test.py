@@ -0,0 +1,107 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from basilisp_blender import batch
+
+# A stand-in for the Blender executable, running the worker script
+# with a `bpy` module that records the scene resets to a log file.
+FAKE_BLENDER = """#!{python}
+import sys
+import types
+
+bpy = types.ModuleType("bpy")
+
+
+class wm:
+    @staticmethod
+    def read_homefile(**kwargs):
+        print(":reset", file=sys.stderr)
+
+    @staticmethod
+    def open_mainfile(filepath, **kwargs):
+        if not filepath.endswith(".blend"):
+            raise RuntimeError(f"Cannot read file {{filepath}}")
+        print(":open", filepath, file=sys.stderr)
+
+
+bpy.ops = types.SimpleNamespace(wm=wm)
+sys.modules["bpy"] = bpy
+exec(sys.argv[sys.argv.index("--python-expr") + 1])
+"""
+
+
+@pytest.fixture
+def blender_path(tmp_path):
+    path = tmp_path / "blender"
+    path.write_text(FAKE_BLENDER.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def test_bencode():
+    value = {"op": "eval", "id": 3, "status": ["done", "ünicode"], "nested": {}}
+    data = batch._bencode(value)
+    assert (value, len(data)) == batch._bdecode(data)
+    for end in range(len(data)):
+        with pytest.raises(batch._Incomplete):
+            batch._bdecode(data[:end])
+
+
+def test_pool(tmp_path, blender_path):
+    script = tmp_path / "job.lpy"
+    script.write_text(
+        '(import os)\n(println :args *command-line-args*)\n(into [(os/getpid)] *command-line-args*)'
+    )
+    failing = tmp_path / "failing.lpy"
+    failing.write_text("(/ 1 0)")
+
+    with batch.BlenderPool(workers=2, blender_path=blender_path) as pool:
+        futures = [pool.submit(str(script), args=[i, "x"]) for i in range(6)]
+        results = [future.result(timeout=60) for future in futures]
+
+        failed = pool.submit(str(failing)).exception(timeout=60)
+        assert isinstance(failed, batch.JobError)
+        assert "ZeroDivisionError" in failed.result["ex"]
+
+        reset_failed = pool.submit(str(script), blend_file="scene.txt").exception(
+            timeout=60
+        )
+        assert isinstance(reset_failed, batch.JobError)
+        assert "Cannot read file" in reset_failed.result["ex"]
+
+        opened = pool.submit(str(script), blend_file="scene.blend").result(timeout=60)
+
+    for i, result in enumerate(results):
+        assert result["ex"] is None
+        assert result["out"] == f':args ["{i}" "x"]\n'
+        assert result["value"].endswith(f' "{i}" "x"]')
+        assert result["script"] == str(script)
+        assert result["worker"] in (0, 1)
+    assert opened["ex"] is None
+    # the jobs ran on the two warm workers, without starting new processes
+    pids = {result["value"].strip("[]").split()[0] for result in results + [opened]}
+    assert 2 == len(pids)
+
+
+def test_pool_worker_exit(blender_path, tmp_path):
+    script = tmp_path / "exit.lpy"
+    script.write_text("(import os) (os/_exit 3)")
+    script_ok = tmp_path / "ok.lpy"
+    script_ok.write_text("(import os) :ok")
+
+    with batch.BlenderPool(workers=1, blender_path=blender_path) as pool:
+        exited = pool.submit(str(script)).exception(timeout=60)
+        # the worker is restarted for the next job
+        ok = pool.submit(str(script_ok)).result(timeout=60)
+
+    assert isinstance(exited, ConnectionError)
+    assert ":ok" == ok["value"]
+
+
+def test_pool_blender_not_found(monkeypatch):
+    monkeypatch.setenv("PATH", "")
+    with pytest.raises(ValueError):
+        batch.BlenderPool(workers=1)
@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+import basilisp_blender
 from basilisp_blender import eval as evl
 
 
@@ -35,3 +36,192 @@ def test_eval_file(capsys, result, code):
         assert captured.out == result
     finally:
         os.remove(temp.name)
+
+
+def test_eval_str_cache():
+    evl.eval_cache_clear()
+    try:
+        evl.eval_str("(defn cache-test-fn [x] (* x 2))", cache=False)
+        assert evl.eval_cache_info() == (0, 0, evl.EVAL_CACHE_MAXSIZE, 0)
+
+        assert 10 == evl.eval_str("(cache-test-fn 5)")
+        assert 10 == evl.eval_str("(cache-test-fn 5)")
+        assert evl.eval_cache_info() == (1, 1, evl.EVAL_CACHE_MAXSIZE, 1)
+
+        # redefining a referenced var invalidates the entry
+        evl.eval_str("(defn cache-test-fn [x] (* x 3))", cache=False)
+        assert 15 == evl.eval_str("(cache-test-fn 5)")
+        assert evl.eval_cache_info() == (1, 2, evl.EVAL_CACHE_MAXSIZE, 1)
+
+        # macros are recompiled too
+        evl.eval_str("(defmacro cache-test-m [x] `(inc ~x))", cache=False)
+        assert 2 == evl.eval_str("(cache-test-m 1)")
+        evl.eval_str("(defmacro cache-test-m [x] `(dec ~x))", cache=False)
+        assert 0 == evl.eval_str("(cache-test-m 1)")
+
+        # shadowing a referred var invalidates the cache
+        assert 2 == evl.eval_str("(inc 1)")
+        evl.eval_str("(defn inc [x] (+ x 100))", cache=False)
+        assert 101 == evl.eval_str("(inc 1)")
+        evl.eval_str("(ns-unmap *ns* 'inc)", cache=False)
+
+        # forms redefining vars they reference remain cached
+        evl.eval_str("(def cache-test-counter 0)", cache=False)
+        for i in range(1, 4):
+            assert i == evl.eval_str(
+                "(def cache-test-counter (inc cache-test-counter)) cache-test-counter"
+            )
+        assert evl.eval_cache_info().hits == 3
+
+        assert evl.EOF_ is evl.eval_str("")
+    finally:
+        evl.eval_cache_clear(evl.EVAL_CACHE_MAXSIZE)
+
+
+def test_eval_str_cache_lru():
+    evl.eval_cache_clear(maxsize=2)
+    try:
+        for code in ["(+ 1 1)", "(+ 1 2)", "(+ 1 1)", "(+ 1 3)", "(+ 1 2)"]:
+            evl.eval_str(code)
+        assert evl.eval_cache_info() == (1, 4, 2, 2)
+
+        evl.eval_cache_clear(maxsize=0)
+        assert 3 == evl.eval_str("(+ 1 2)")
+        assert evl.eval_cache_info() == (0, 0, 0, 0)
+    finally:
+        evl.eval_cache_clear(evl.EVAL_CACHE_MAXSIZE)
+
+
+def test_eval_file_cache(tmp_path, capsys):
+    codepath = tmp_path / "eval-file-cache-test.lpy"
+    cache_dir = tmp_path / "cache"
+    codepath.write_text(
+        """(import sys)
+(defmacro eval-file-cache-twice [x] `(* 2 ~x))
+(.write sys/stdout (str :result " " (eval-file-cache-twice 5)))
+(eval-file-cache-twice 7)"""
+    )
+
+    cache_path = evl.file_cache_path(codepath, cache_dir)
+    assert not cache_path.exists()
+    assert 14 == evl.eval_file(codepath, cache=True, cache_dir=cache_dir)
+    assert capsys.readouterr().out == ":result 10"
+    assert cache_path.exists()
+
+    mtime = cache_path.stat().st_mtime_ns
+    assert 14 == evl.eval_file(codepath, cache=True, cache_dir=cache_dir)
+    assert capsys.readouterr().out == ":result 10"
+    assert mtime == cache_path.stat().st_mtime_ns
+
+    # changed contents are recompiled
+    codepath.write_text("(+ 1 2)")
+    assert 3 == evl.eval_file(codepath, cache=True, cache_dir=cache_dir)
+    assert 3 == evl.eval_file(codepath, cache=True, cache_dir=cache_dir)
+
+    # corrupted cache files are recompiled
+    cache_path.write_bytes(evl.FILE_CACHE_MAGIC_ + b"garbage")
+    assert 3 == evl.eval_file(codepath, cache=True, cache_dir=cache_dir)
+
+    assert evl.file_cache_path(codepath) == (
+        tmp_path / "__pycache__" / cache_path.name.split("-", 1)[1]
+    )
+
+
+def test_eval_str_incremental():
+    evl.eval_str("(def incr-test-log (atom []))", cache=False)
+    log = lambda: evl.eval_str("@incr-test-log", cache=False)
+    code = """(swap! incr-test-log conj :a) (def incr-test-a 1)
+(defn incr-test-b [] (swap! incr-test-log conj :b) (+ incr-test-a 1))
+(swap! incr-test-log conj :c)
+(incr-test-b)"""
+    try:
+        assert 2 == evl.eval_str_incremental(code, "test")
+        assert [":a", ":c", ":b"] == [str(k) for k in log()]
+
+        # nothing changed
+        assert evl.eval_str_incremental(code, "test") is None
+        assert 3 == len(log())
+
+        # only the changed form and its dependents are re-evaluated
+        evl.eval_str("(reset! incr-test-log [])", cache=False)
+        code = code.replace("(def incr-test-a 1)", "(def incr-test-a 10)")
+        assert 11 == evl.eval_str_incremental(code, "test")
+        assert [":b"] == [str(k) for k in log()]
+
+        # new forms are evaluated
+        evl.eval_str("(reset! incr-test-log [])", cache=False)
+        assert 5 == evl.eval_str_incremental(code + "\n(+ 2 3)", "test")
+        assert [] == list(log())
+
+        evl.eval_incremental_reset("test")
+        assert 5 == evl.eval_str_incremental(code + "\n(+ 2 3)", "test")
+        assert [":a", ":c", ":b"] == [str(k) for k in log()]
+    finally:
+        evl.eval_incremental_reset()
+
+
+def test_eval_str_incremental_ns():
+    code = """(ns incr-test-ns)
+(def log (atom []))
+(defn a [] 1)
+(defn b [] (swap! log conj :b) (+ (a) 1))
+(b)"""
+    try:
+        assert 2 == evl.eval_str_incremental(code, "test")
+
+        # forms after the ns form are evaluated and resolved in it
+        code = code.replace("(defn a [] 1)", "(defn a [] 10)")
+        assert 11 == evl.eval_str_incremental(code, "test")
+        assert [":b", ":b"] == [
+            str(k) for k in evl.eval_str("@incr-test-ns/log", cache=False)
+        ]
+        assert evl.eval_str_incremental(code, "test") is None
+        assert "incr-test-ns" == evl.eval_str("(str *ns*)", cache=False)
+    finally:
+        evl.eval_incremental_reset()
+        evl.eval_str(f"(in-ns '{evl.EVALUATION_NS_})", cache=False)
+
+
+def test_eval_str_profile(tmp_path):
+    import pstats
+
+    code = "(defn profile-test-f [n] (reduce + (range n)))\n(profile-test-f 1000)"
+    profile = evl.eval_str_profile(code, top=5, prof_dir=str(tmp_path))
+    assert 499500 == profile["result"]
+    assert profile["compile_ms"] >= 0
+    assert profile["run_ms"] > 0
+    assert 5 == len(profile["top"])
+    tottimes = [row["tottime_ms"] for row in profile["top"]]
+    assert sorted(tottimes, reverse=True) == tottimes
+    assert str(tmp_path / evl.PROFILE_FILENAME) == profile["prof_file"]
+    assert pstats.Stats(profile["prof_file"]).total_calls > 0
+
+    with pytest.raises(ZeroDivisionError):
+        evl.eval_str_profile("(/ 1 0)")
+
+
+def test_fn_profile():
+    profile = evl.fn_profile(lambda: sum(range(1000)), top=3)
+    assert 499500 == profile["result"]
+    assert profile["run_ms"] > 0
+    assert 3 >= len(profile["top"])
+    assert profile["prof_file"] is None
+
+    with pytest.raises(ZeroDivisionError):
+        evl.fn_profile(lambda: 1 / 0)
+
+
+def test_eval_str_thread():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        ns = executor.submit(evl.eval_str, "(str *ns*)", False).result()
+    assert evl.EVALUATION_NS_ == ns
+
+
+def test_startup_report():
+    assert 3 == evl.eval_str("(+ 1 2)")
+    report = basilisp_blender.startup_report()
+    assert "basilisp-init" in report
+    assert "eval-ns-init" in report
+    assert all(t >= 0 for t in report.values())
@@ -0,0 +1,13 @@
+import pytest
+
+from tests.basilisp_blender.integration import integ_utils as iu
+
+
+@pytest.fixture(scope="session")
+def blender_worker():
+    """The background Blender worker of this test process, see
+    `integ_utils.blender_worker`, stopped at the end of the session.
+
+    """
+    yield iu.blender_worker()
+    iu.blender_worker_stop()
@@ -0,0 +1,22 @@
+from basilisp_blender import batch
+from dev.dev_utils import blender_exec_path_get
+
+
+def test_pool(tmp_path):
+    script = tmp_path / "job.lpy"
+    script.write_text(
+        """(import bpy)
+(let [cube (aget bpy.data/objects "Cube")]
+  (set! (.-name cube) (first *command-line-args*))
+  (sort (map #(.-name %) bpy.data/objects)))"""
+    )
+
+    with batch.BlenderPool(workers=2, blender_path=blender_exec_path_get()) as pool:
+        futures = [pool.submit(str(script), args=[f"cube-{i}"]) for i in range(4)]
+        results = [future.result(timeout=120) for future in futures]
+
+    # each job sees a fresh factory startup scene
+    for i, result in enumerate(results):
+        assert result["ex"] is None, result["err"]
+        assert f'("Camera" "Light" "cube-{i}")' == result["value"]
+    assert {0, 1} == {result["worker"] for result in results}
@@ -2,8 +2,8 @@ import pytest
 
 from tests.basilisp_blender.integration import integ_utils as iu
 
-def test_eval_editor():
-    result = iu.blender_eval(
+def test_eval_editor(blender_worker):
+    result = iu.blender_worker_py_eval(
         """from basilisp_blender import eval as evl
 import bpy
 before = 0
@@ -23,3 +23,26 @@ print(f":result :before {before} :after {after}")
 """
     )
     assert ":result :before 0 :after 1" in result.stdout
+
+
+def test_eval_editor_incremental(blender_worker):
+    result = iu.blender_worker_py_eval(
+        """from basilisp_blender import eval as evl
+import bpy
+
+def count():
+  return len([obj for obj in bpy.data.objects if obj.name.startswith("Suzanne")])
+
+block = bpy.data.texts.new(name="basilisp-blender-test")
+block.write("(import bpy) (-> bpy/ops .-mesh (.primitive_monkey_add ** :location [0,0,0]))")
+evl.eval_editor("basilisp-blender-test", incremental=True)
+first = count()
+evl.eval_editor("basilisp-blender-test", incremental=True)
+second = count()
+block.write("\\n(-> bpy/ops .-mesh (.primitive_monkey_add ** :location [1,0,0]))")
+evl.eval_editor("basilisp-blender-test", incremental=True)
+third = count()
+print(f":result :first {first} :second {second} :third {third}")
+"""
+    )
+    assert ":result :first 1 :second 1 :third 2" in result.stdout
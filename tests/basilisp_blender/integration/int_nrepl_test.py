@@ -12,6 +12,8 @@ import tests.basilisp_blender.integration.integ_utils as iu
     reason="GHA UI testing is only supported on Linux.",
 )
 def test_server_start(tmp_path):
+    # The server is driven by bpy timers, which the shared background
+    # `blender_worker` does not run, hence a Blender of its own.
     codefile = tmp_path / "server-start-code-file.py"
     portfile = tmp_path / ".basilisp-blender-int-test-port"
     logfile = tmp_path / "basilisp-blender-int-server-start.log"
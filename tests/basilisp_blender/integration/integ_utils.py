@@ -1,11 +1,63 @@
 "Integration test utils."
+import atexit
+import json
 import os
 import subprocess
 import tempfile
 import time
 
+from basilisp_blender.batch import BlenderWorker
 from dev.dev_utils import blender_exec_path_get
 
+# The Blender worker of this process, see `blender_worker`.
+_WORKER = None
+
+# The JSON object of the namespaces of the `_WORKER` when started, to
+# the names of their interned vars, see `blender_worker_reset`.
+_WORKER_NS_BASELINE = None
+
+# The Basilisp code printing the JSON object of the loaded namespaces
+# to the names of their interned vars.
+_WORKER_NS_SNAPSHOT_CODE = """(import json)
+(print (json/dumps (python/dict (map (fn [ns] [(str (ns-name ns))
+                                               (python/list (map str (keys (ns-interns ns))))])
+                                     (all-ns)))))"""
+
+# The Basilisp code unloading the namespaces created since the
+# `baseline` JSON object of `_WORKER_NS_SNAPSHOT_CODE` was taken, except
+# for the libraries under `basilisp`, and unmapping the vars interned
+# since in the others.
+_WORKER_NS_RESET_CODE = """(import json sys)
+(let [baseline (json/loads {baseline})]
+  (doseq [ns (all-ns)
+          :let [ns-str (str (ns-name ns))
+                names (some-> (.get baseline ns-str) set)]]
+    (cond
+      names
+      (doseq [sym (keys (ns-interns ns))
+              :when (not (contains? names (str sym)))]
+        (ns-unmap ns sym))
+
+      (not (.startswith ns-str "basilisp"))
+      (do (remove-ns (symbol ns-str))
+          (.pop sys/modules (munge ns-str) nil)))))
+nil"""
+
+# The Python code executing the code in the `path` file, capturing its
+# stdout, stderr and exit code as a JSON array in `result`.
+_WORKER_PY_EVAL_CODE = """
+import contextlib, io, json, traceback
+out, err, returncode = io.StringIO(), io.StringIO(), 0
+with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+    try:
+        with open(path) as f:
+            exec(compile(f.read(), path, "exec"), {"__name__": "__main__"})
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+result = json.dumps([returncode, out.getvalue(), err.getvalue()])
+"""
+
 def blender_run(*args, background=False):
     """Executes the Blender executable located using the
     `blender_exec_path_get` function, in a subprocess with the
@@ -83,3 +135,81 @@ def blender_lpy_eval_file(filepath):
 evl.eval_file({path})
 """
     return blender_eval(py_code)
+
+
+def blender_worker():
+    """Returns the background Blender worker of this process, started on
+    first use and stopped on exit, see
+    `basilisp_blender.batch.BlenderWorker`.
+
+    Tests evaluating code in it, rather than in a new Blender process,
+    only pay for Blender startup once per test process.
+
+    """
+    global _WORKER, _WORKER_NS_BASELINE
+    if _WORKER is None:
+        worker = BlenderWorker(blender_exec_path_get())
+        worker.start()
+        atexit.register(worker.stop)
+        result = worker.eval(_WORKER_NS_SNAPSHOT_CODE, timeout_sec=60)
+        assert result["ex"] is None, result["err"]
+        _WORKER_NS_BASELINE = result["out"].strip()
+        _WORKER = worker
+    return _WORKER
+
+
+def blender_worker_stop():
+    "Stops the `blender_worker` of this process, if started."
+    global _WORKER
+    if _WORKER is not None:
+        _WORKER.stop()
+        _WORKER = None
+
+
+def blender_worker_reset():
+    """Resets the `blender_worker` to the factory startup file, which
+    replaces all of its bpy data, and unloads the namespaces created
+    since it started, and the vars interned since in the others, such
+    as `user`.
+
+    The `basilisp` and `basilisp-blender` libraries loaded by a test
+    stay loaded, as they would in a Blender session, so that their
+    handlers are not registered twice. Tests depending on other state
+    kept by these libraries, or on Blender's UI and event loop, such as
+    those running the timer driven nREPL server of
+    `basilisp_blender.nrepl`, must run in a Blender of their own, see
+    `blender-eval`'s `:terminate? false` option.
+
+    """
+    worker = blender_worker()
+    result = worker.reset(timeout_sec=60)
+    assert result["ex"] is None, result["err"]
+    result = worker.eval(
+        _WORKER_NS_RESET_CODE.format(baseline=json.dumps(_WORKER_NS_BASELINE)),
+        timeout_sec=60,
+    )
+    assert result["ex"] is None, result["err"]
+
+
+def blender_worker_py_eval(code):
+    """Executes the Python `code` in the `blender_worker` after resetting
+    it, and returns a `subprocess.CompletedProcess` with its captured
+    stdout and stderr, like `blender_eval`.
+
+    """
+    blender_worker_reset()
+    fd, path = tempfile.mkstemp(suffix=".py", prefix="basilisp-blender-test_")
+    try:
+        with os.fdopen(fd, "w") as temp_file:
+            temp_file.write(code)
+        result = blender_worker().eval(
+            f"(let [g (python/dict ** :path {json.dumps(path)})]"
+            f" (python/exec {json.dumps(_WORKER_PY_EVAL_CODE)} g)"
+            ' (print (aget g "result")))',
+            timeout_sec=60,
+        )
+        assert result["ex"] is None, result["err"]
+        returncode, stdout, stderr = json.loads(result["out"])
+        return subprocess.CompletedProcess([path], returncode, stdout, stderr)
+    finally:
+        os.unlink(path)
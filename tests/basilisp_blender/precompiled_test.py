@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+
+from basilisp_blender import precompiled
+
+
+def _python_run(code):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout, result.stderr
+
+
+def test_bundle_create_load(tmp_path):
+    bundle_dir = str(tmp_path / "precompiled")
+    _python_run(
+        "from basilisp_blender import precompiled\n"
+        f"precompiled.bundle_create({bundle_dir!r}, ['basilisp-blender.utils'])\n"
+    )
+    with open(os.path.join(bundle_dir, precompiled.BUNDLE_INDEX_FILENAME)) as f:
+        index = json.load(f)
+    assert index["cache_tag"] == sys.implementation.cache_tag
+    assert {"basilisp.core", "basilisp_blender.utils"} <= set(index["namespaces"])
+    for entry in index["namespaces"].values():
+        assert os.path.isfile(os.path.join(bundle_dir, entry["file"]))
+
+    _, err = _python_run(
+        "import importlib, logging\n"
+        "from basilisp_blender import init, log_level_set\n"
+        "log_level_set(logging.DEBUG)\n"
+        f"init({bundle_dir!r})\n"
+        "importlib.import_module('basilisp_blender.utils')\n"
+    )
+    assert ":precompiled-loaded basilisp.core\n" in err
+    assert ":precompiled-loaded basilisp_blender.utils\n" in err
+
+
+def test_bundle_load_unavailable(tmp_path):
+    assert 0 == precompiled.bundle_load(str(tmp_path))
+
+    index = dict(precompiled._bundle_compat_get(), cache_tag="other-99", namespaces={})
+    with open(tmp_path / precompiled.BUNDLE_INDEX_FILENAME, "w") as f:
+        json.dump(index, f)
+    assert 0 == precompiled.bundle_load(str(tmp_path))
+
+
+def test_bundle_load_unsupported(tmp_path, monkeypatch):
+    index = dict(precompiled._bundle_compat_get(), namespaces={})
+    with open(tmp_path / precompiled.BUNDLE_INDEX_FILENAME, "w") as f:
+        json.dump(index, f)
+    monkeypatch.delattr(precompiled.importer, "_get_basilisp_bytecode")
+    assert ["_get_basilisp_bytecode"] == precompiled._importer_internals_missing()
+    assert 0 == precompiled.bundle_load(str(tmp_path))
+
+
+def test_panel_addon_compiles():
+    # The add-on is also the extension's __init__.py, see scripts/.
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "src", "dev", "nrepl_panel_addon.py"
+    )
+    with open(path, encoding="utf-8") as f:
+        compile(f.read(), path, "exec")
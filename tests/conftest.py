@@ -5,6 +5,10 @@ import os
 
 def pytest_addoption(parser):
     parser.addoption("--integration", action="store_true", help="Only run integration tests.")
+    parser.addoption(
+        "--shard",
+        help="Only run the INDEX/COUNT shard of the tests, e.g. 0/4 for the first of four.",
+    )
 
 def pytest_collection_modifyitems(config, items):
     int_path = 'tests/basilisp_blender/integration'
@@ -14,4 +18,8 @@ def pytest_collection_modifyitems(config, items):
     else:
         items[:] = [item for item in items if Path(int_path).absolute() not in Path(item.fspath).parents]
 
+    if shard := config.getoption("--shard"):
+        index, count = (int(n) for n in shard.split("/"))
+        items[:] = [item for i, item in enumerate(items) if i % count == index]
+
 